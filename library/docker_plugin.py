@@ -96,14 +96,12 @@ facts:
 
 try:
     from docker.errors import APIError, NotFound
-    from docker.models.plugins import Plugin
     from docker import DockerClient
 except ImportError:
     # missing docker-py handled in ansible.module_utils.docker_common
     pass
 
 from ansible_collections.community.general.plugins.module_utils.docker.common import DockerBaseClass, AnsibleDockerClient, DifferenceTracker
-from ansible.module_utils.six import text_type
 
 
 class TaskParameters(DockerBaseClass):
@@ -111,13 +109,12 @@ class TaskParameters(DockerBaseClass):
         super(TaskParameters, self).__init__()
         self.client = client
 
-        self.name = None
-        self.alias = None
-        self.plugin_options = None
-        self.debug = None
+        # Module parameters always hold every key declared in the argument spec
+        self.__dict__.update(client.module.params)
 
-        for key, value in client.module.params.items():
-            setattr(self, key, value)
+        self.prepared_options = prepare_options(self.plugin_options)
+        # Requested options as the daemon reports them back, so they compare with the plugin Env
+        self.rendered_options = parse_options(self.prepared_options)
 
 
 def prepare_options(options):
@@ -125,12 +122,11 @@ def prepare_options(options):
 
 
 def parse_options(options_list):
-    return dict((k, v) for k, v in map(lambda x: x.split('=', 1), options_list)) if options_list else {}
+    return dict(s.partition('=')[::2] for s in options_list) if options_list else {}
 
 
 def wrap_error(prefix, error):
-    error_message = text_type(error)
-    return ". ".join([str(prefix), str(error_message)])
+    return u"%s. %s" % (prefix, error)
 
 
 class DockerPluginManager(object):
@@ -138,30 +134,33 @@ class DockerPluginManager(object):
     def __init__(self, client):
         self.client = client
 
-        self.dclient = DockerClient(**self.client._connect_params)
+        # Collections only go through the api attribute, reuse the already connected client
+        # instead of letting DockerClient.__init__ open and negotiate its own connection
+        self.dclient = DockerClient.__new__(DockerClient)
         self.dclient.api = client
 
         self.parameters = TaskParameters(client)
         self.check_mode = self.client.check_mode
         self.results = {
-            u'changed': False,
-            u'actions': []
+            u'changed': False
         }
+        self._actions = []
         self.diff = self.client.module._diff
         self.diff_tracker = DifferenceTracker()
         self.diff_result = dict()
 
         self.existing_plugin = self.get_existing_plugin()
 
-        state = self.parameters.state
-        if state == 'present':
-            self.present()
-        elif state == 'absent':
-            self.absent()
-        elif state == 'enabled':
-            self.enable()
-        elif state == 'disabled':
-            self.disable()
+        # State is restricted to these choices by the argument spec
+        {
+            'present': self.present,
+            'absent': self.absent,
+            'enabled': self.enable,
+            'disabled': self.disable,
+        }[self.parameters.state]()
+
+        if self.check_mode or self.parameters.debug:
+            self.results['actions'] = self._actions
 
         if self.diff or self.check_mode or self.parameters.debug:
             if self.diff:
@@ -183,169 +182,208 @@ class DockerPluginManager(object):
             return plugin
         return None
 
+    def _existing_options(self):
+        """
+        Return the options of the existing plugin that the current parameters must be compared with.
+
+        :return: parsed plugin Env, or None when the parameters cannot differ from it
+        """
+        if not self.parameters.plugin_options:
+            return None
+        env = self.existing_plugin.settings.get('Env') or []
+        # Identical environments cannot differ
+        if set(self.parameters.prepared_options) == set(env):
+            return None
+        return parse_options(env)
+
     def has_different_config(self):
         """
         Return the list of differences between the current parameters and the existing plugin.
 
-        :return: list of options that differ
+        :return: list of options that differ, or None when nothing differs
         """
-        differences = DifferenceTracker()
-        if self.parameters.plugin_options:
-            existing_options = parse_options(self.existing_plugin.settings['Env'])
-            if not existing_options:
-                differences.add('plugin_options', parameter=self.parameters.plugin_options, active=existing_options)
-            else:
-                for key, value in self.parameters.plugin_options.items():
-                    active_value = existing_options.get(key)
-                    if active_value != value:
-                        differences.add('plugin_options.%s' % key, parameter=value, active=active_value)
+        existing_options = self._existing_options()
+        if existing_options is None:
+            return None
+        differences = None
+        if not existing_options:
+            differences = DifferenceTracker()
+            differences.add('plugin_options', parameter=self.parameters.plugin_options, active={})
+            return differences
+        for key, value in self.parameters.rendered_options.items():
+            active_value = existing_options.get(key)
+            if active_value != value:
+                if differences is None:
+                    differences = DifferenceTracker()
+                differences.add('plugin_options.%s' % key, parameter=value, active=active_value)
         return differences
 
+    def fast_config_differs(self):
+        """
+        Check whether the current parameters differ from the existing plugin.
+
+        :return: True as soon as one option differs, without tracking differences
+        """
+        existing_options = self._existing_options()
+        if existing_options is None:
+            return False
+        return any(existing_options.get(key) != value for key, value in self.parameters.rendered_options.items())
+
+    def compare_config(self):
+        """
+        Compare the current parameters with the existing plugin.
+
+        Differences are only tracked when they are reported back to the user.
+
+        :return: tuple of a flag telling if the config differs and the tracked differences or None
+        """
+        if not self.existing_plugin:
+            return False, None
+        if self.diff or self.check_mode or self.parameters.debug:
+            differences = self.has_different_config()
+            return differences is not None and not differences.empty, differences
+        return self.fast_config_differs(), None
+
     def install_plugin(self):
         # Perform action only when plugin is not already installed
         if not self.existing_plugin:
+            alias, name = self.parameters.alias, self.parameters.name
             if not self.check_mode:
                 try:
-                    self.existing_plugin = self.dclient.plugins.install(self.parameters.name, self.parameters.alias)
+                    self.existing_plugin = self.dclient.plugins.install(name, alias)
                 except APIError as error:
                     msg = wrap_error(
-                        prefix="Failed to install local docker logging plugin %s from %s" % (self.parameters.alias, self.parameters.name),
+                        prefix="Failed to install local docker logging plugin %s from %s" % (alias, name),
                         error=error
                     )
                     self.client.fail(msg)
             # Set results
-            self.results['actions'].append("Installed local docker logging plugin %s from %s." % (self.parameters.alias, self.parameters.name))
+            self._actions.append("Installed local docker logging plugin %s from %s." % (alias, name))
             self.results['changed'] = True
 
     def remove_plugin(self):
         # Perform action only when plugin is installed
-        if self.existing_plugin:
+        plugin = self.existing_plugin
+        if plugin:
+            alias = self.parameters.alias
             if not self.check_mode:
                 try:
-                    self.existing_plugin.remove()
+                    plugin.remove()
                 except APIError as error:
                     msg = wrap_error(
-                        prefix="Failed to remove local docker logging plugin %s" % self.parameters.alias,
+                        prefix="Failed to remove local docker logging plugin %s" % alias,
                         error=error
                     )
                     self.client.fail(msg)
             # Set results
-            self.results['actions'].append("Removed local docker logging plugin %s." % self.parameters.alias)
+            self._actions.append("Removed local docker logging plugin %s." % alias)
             self.results['changed'] = True
 
-    def enable_plugin(self, main_action=True):
-        # We want to know if the plugin is installed
-        self.existing_plugin = self.get_existing_plugin()
-        if not self.existing_plugin.enabled:
-            if not self.check_mode:
-                try:
-                    self.existing_plugin.enable(1)
-                except APIError as error:
-                    msg = wrap_error(
-                        prefix=(
-                            "Failed to enable local docker logging plugin %s. " % self.parameters.alias,
-                        ),
-                        error=error
-                    )
-                    self.client.fail(msg)
-            # Set results optionnaly
-            if main_action:
-                self.results['actions'].append("Enabled local docker logging plugin %s." % self.parameters.alias)
-                self.results['changed'] = True
-
-    def disable_plugin(self, main_action=True):
-        if self.existing_plugin: 
-            if self.existing_plugin.enabled:
-                if not self.check_mode:
-                    try:
-                        self.existing_plugin.disable()
-                    except APIError as error:
-                        msg = wrap_error(
-                            prefix=(
-                                "Failed to disable local docker logging plugin %s. " % self.parameters.alias,
-                            ),
-                            error=error
-                        )
-                        self.client.fail(msg)
-                # Set results optionnaly
-                if main_action:
-                    self.results['actions'].append("Disabled local docker logging plugin %s." % self.parameters.alias)
-                    self.results['changed'] = True
+    def _enable_plugin_op(self):
+        # Return whether the plugin had to be enabled
+        plugin = self.existing_plugin
+        if plugin.enabled:
+            return False
+        if not self.check_mode:
+            try:
+                plugin.enable(1)
+            except APIError as error:
+                msg = wrap_error(
+                    prefix="Failed to enable local docker logging plugin %s" % self.parameters.alias,
+                    error=error
+                )
+                self.client.fail(msg)
+        return True
 
-    def update_plugin(self, differences):
+    def _disable_plugin_op(self):
+        # Return whether the plugin had to be disabled
+        plugin = self.existing_plugin
+        if not plugin or not plugin.enabled:
+            return False
         if not self.check_mode:
-            must_enable = self.parameters.state == "enabled"
-            # Plugin must be disabled to be updated
-            if self.existing_plugin.enabled:
-                self.disable_plugin(main_action=False)
-                if self.parameters.state in ["present", "enabled"]:
-                    need_enable = True
-            # Update the configuration
             try:
-                self.existing_plugin.configure(prepare_options(self.parameters.plugin_options))
+                plugin.disable()
             except APIError as error:
                 msg = wrap_error(
-                    prefix=(
-                        "Failed to update local docker logging plugin %s" % self.parameters.alias,
-                    ),
+                    prefix="Failed to disable local docker logging plugin %s" % self.parameters.alias,
                     error=error
                 )
                 self.client.fail(msg)
+        return True
+
+    def enable_plugin(self):
+        # Only query the daemon when no plugin is known yet
+        if self.existing_plugin is None:
+            self.existing_plugin = self.get_existing_plugin()
+        if self._enable_plugin_op():
+            # Set results
+            self._actions.append("Enabled local docker logging plugin %s." % self.parameters.alias)
+            self.results['changed'] = True
+
+    def disable_plugin(self):
+        if self._disable_plugin_op():
+            # Set results
+            self._actions.append("Disabled local docker logging plugin %s." % self.parameters.alias)
+            self.results['changed'] = True
+
+    def _reconfigure(self, options, enable):
+        # Issue the raw API calls and reload the plugin only once at the end
+        plugin = self.existing_plugin
+        step = "disable"
+        try:
+            # Plugin must be disabled to be updated
+            if plugin.enabled:
+                self.client.disable_plugin(plugin.name)
+            step = "configure"
+            self.client.configure_plugin(plugin.name, options)
+            if enable:
+                step = "enable"
+                self.client.enable_plugin(plugin.name, 1)
+            plugin.reload()
+        except APIError as error:
+            msg = wrap_error(
+                prefix="Failed to update local docker logging plugin %s (%s step)" % (self.parameters.alias, step),
+                error=error
+            )
+            self.client.fail(msg)
+
+    def update_plugin(self, differences):
+        if not self.check_mode:
             # Enable the plugin when needed
-            if must_enable:
-                self.enable_plugin(main_action=False)
+            self._reconfigure(self.parameters.prepared_options, enable=self.parameters.state == "enabled")
         # Set results
-        self.results['actions'].append("Updated local docker logging plugin %s settings." % self.parameters.alias)
+        self._actions.append("Updated local docker logging plugin %s settings." % self.parameters.alias)
         self.results['changed'] = True
 
-    def present(self):
-        differences = DifferenceTracker()
-
-        if self.existing_plugin:
-            differences = self.has_different_config()
+    def install_or_update(self, enable=False):
+        differs, differences = self.compare_config()
 
         self.diff_tracker.add('exists', parameter=True, active=self.existing_plugin is not None)
 
-        if not differences.empty:
-            # Plugin already exists
+        if differs:
+            # Plugin already exists, let's update plugin
             self.update_plugin(differences)
         else:
-            # Let's install plugin
+            # Or install and optionally enable plugin
             self.install_plugin()
+            if enable:
+                self.enable_plugin()
 
         if self.diff or self.check_mode or self.parameters.debug:
-            self.results['diff'] = differences.get_legacy_docker_diffs()
-            self.diff_tracker.merge(differences)
+            if differences is None:
+                self.results['diff'] = []
+            else:
+                self.results['diff'] = differences.get_legacy_docker_diffs()
+                self.diff_tracker.merge(differences)
 
-        if not self.check_mode and not self.parameters.debug:
-            self.results.pop('actions')
+    def present(self):
+        self.install_or_update()
 
     def absent(self):
         self.remove_plugin()
 
     def enable(self):
-        differences = DifferenceTracker()
-
-        if self.existing_plugin:
-            differences = self.has_different_config()
-
-        self.diff_tracker.add('exists', parameter=True, active=self.existing_plugin is not None)
-
-        # Plugin already exists
-        if not differences.empty:
-            # Let's update plugin
-            self.update_plugin(differences)
-        else:
-            # Or install and enable plugin
-            self.install_plugin()
-            self.enable_plugin()
-
-        if self.diff or self.check_mode or self.parameters.debug:
-            self.results['diff'] = differences.get_legacy_docker_diffs()
-            self.diff_tracker.merge(differences)
-
-        if not self.check_mode and not self.parameters.debug:
-            self.results.pop('actions')
+        self.install_or_update(enable=True)
 
     def disable(self):
         self.disable_plugin()